@@ -395,6 +395,13 @@ class LinkItem(QGraphicsWidget):
             self.__channelNamesVisible = visible
         self.__initChannelNameOpacity()
 
+    def channelNamesVisible(self):
+        # type: () -> bool
+        """
+        Return the visibility of the channel name text.
+        """
+        return self.__channelNamesVisible
+
     def setSourceName(self, name):
         # type: (str) -> None
         """
@@ -137,3 +137,13 @@ class TestLinkItem(TestItems):
         self.assertFalse(link.isEnabled())
         link.setEnabled(True)
         self.assertTrue(link.isEnabled())
+
+    def test_channel_names_visible(self):
+        link = LinkItem()
+        self.assertTrue(link.channelNamesVisible())
+        link.setChannelNamesVisible(False)
+        self.assertFalse(link.channelNamesVisible())
+        self.assertEqual(link.linkTextItem.opacity(), 0)
+        link.setChannelNamesVisible(True)
+        self.assertTrue(link.channelNamesVisible())
+        self.assertEqual(link.linkTextItem.opacity(), 1)
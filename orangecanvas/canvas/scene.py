@@ -5,23 +5,21 @@ Canvas Graphics Scene
 
 """
 import typing
-from typing import Dict, List, Optional, Any, Type, Tuple, Union
+from typing import (
+    Dict, List, Set, Optional, Any, Type, Tuple, Union, Callable
+)
 
 import logging
-import itertools
-
-from operator import attrgetter
-
-from xml.sax.saxutils import escape
 
 from AnyQt.QtWidgets import QGraphicsScene, QGraphicsItem
 from AnyQt.QtGui import QPainter, QColor, QFont
 from AnyQt.QtCore import (
-    Qt, QPointF, QRectF, QSizeF, QLineF, QBuffer, QObject, QSignalMapper,
+    Qt, QPointF, QRectF, QSizeF, QLineF, QBuffer, QObject, QTimer,
     QParallelAnimationGroup, QT_VERSION
 )
 from AnyQt.QtSvg import QSvgGenerator
-from AnyQt.QtCore import pyqtSignal as Signal
+from AnyQt import sip
+from AnyQt.QtCore import pyqtSignal as Signal, pyqtSlot as Slot
 
 from ..registry import (
     WidgetRegistry, WidgetDescription, CategoryDescription,
@@ -46,6 +44,52 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
+#: Size of the scene rect used for hit testing in `CanvasScene.item_at`
+_HIT_TEST_SIZE = QSizeF(1, 1)
+
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class _Bidict(typing.Generic[K, V]):
+    """
+    A one to one mapping that also maintains its inverse mapping (`inv`).
+
+    Mapping a value that is already mapped from a different key raises
+    a `ValueError`.
+    """
+    __slots__ = ("forward", "inv")
+
+    def __init__(self):
+        # type: () -> None
+        self.forward = {}  # type: Dict[K, V]
+        self.inv = {}  # type: Dict[V, K]
+
+    def __setitem__(self, key, value):
+        # type: (K, V) -> None
+        if value in self.inv and self.inv[value] != key:
+            raise ValueError("%r is already mapped from %r"
+                             % (value, self.inv[value]))
+        if key in self.forward:
+            del self.inv[self.forward[key]]
+        self.forward[key] = value
+        self.inv[value] = key
+
+    def __getitem__(self, key):
+        # type: (K) -> V
+        return self.forward[key]
+
+    def __contains__(self, key):
+        # type: (Any) -> bool
+        return key in self.forward
+
+    def pop(self, key):
+        # type: (K) -> V
+        value = self.forward.pop(key)
+        del self.inv[value]
+        return value
+
 
 class CanvasScene(QGraphicsScene):
     """
@@ -99,17 +143,24 @@ class CanvasScene(QGraphicsScene):
 
         # All node items
         self.__node_items = []  # type: List[NodeItem]
-        # Mapping from SchemeNodes to canvas items
-        self.__item_for_node = {}  # type: Dict[SchemeNode, NodeItem]
+        # The same node items as a set (for fast membership tests)
+        self.__node_item_set = set()  # type: Set[NodeItem]
+        # Mapping from SchemeNodes to canvas items (and inverse)
+        self.__item_for_node = _Bidict()  # type: _Bidict[SchemeNode, NodeItem]
         # All link items
         self.__link_items = []  # type: List[LinkItem]
-        # Mapping from SchemeLinks to canvas items.
-        self.__item_for_link = {}  # type: Dict[SchemeLink, LinkItem]
+        # Mapping from SchemeLinks to canvas items (and inverse).
+        self.__item_for_link = _Bidict()  # type: _Bidict[SchemeLink, LinkItem]
+        # Outgoing/incoming link items for each node item (dicts are used
+        # as insertion ordered sets)
+        self.__outgoing = {}  # type: Dict[NodeItem, Dict[LinkItem, None]]
+        self.__incoming = {}  # type: Dict[NodeItem, Dict[LinkItem, None]]
 
         # All annotation items
         self.__annotation_items = []  # type: List[Annotation]
-        # Mapping from SchemeAnnotations to canvas items.
-        self.__item_for_annotation = {}  # type: Dict[BaseSchemeAnnotation, Annotation]
+        # Mapping from SchemeAnnotations to canvas items (and inverse).
+        self.__item_for_annotation = \
+            _Bidict()  # type: _Bidict[BaseSchemeAnnotation, Annotation]
 
         # Is the scene editable
         self.editable = True
@@ -124,67 +175,79 @@ class CanvasScene(QGraphicsScene):
 
         self.user_interaction_handler = None  # type: Optional[UserInteraction]
 
-        self.activated_mapper = QSignalMapper(self)
-        self.activated_mapper.mappedObject.connect(
-            lambda node: self.node_item_activated.emit(node)
-        )
-        self.hovered_mapper = QSignalMapper(self)
-        self.hovered_mapper.mappedObject.connect(
-            lambda node: self.node_item_hovered.emit(node)
-        )
-        self.position_change_mapper = QSignalMapper(self)
-        self.position_change_mapper.mappedObject.connect(
-            self._on_position_change
-        )
-        self.link_activated_mapper = QSignalMapper(self)
-        self.link_activated_mapper.mappedObject.connect(
-            lambda node: self.link_item_activated.emit(node)
-        )
+        # (signal, slot) pairs connected on node/link items by the scene
+        self.__item_connections = {}  # type: Dict[QGraphicsItem, List[Tuple[Any, Callable]]]
 
         self.__anchors_opened = False
 
+        # Node items whose anchor layout invalidation is pending. Node
+        # position changes are coalesced and the layout is invalidated
+        # at most once per `__layout_timer` interval.
+        self.__pending_layout_nodes = {}  # type: Dict[NodeItem, None]
+        self.__layout_timer = QTimer(self, singleShot=True, interval=16)
+        self.__layout_timer.timeout.connect(self.__invalidate_pending_nodes)
+
+        # Cached __str__ (invalidated when the objectName changes)
+        self.__str = None  # type: Optional[str]
+        self.objectNameChanged.connect(self.__on_object_name_changed)
+
     def clear_scene(self):  # type: () -> None
         """
         Clear (reset) the scene.
         """
-        if self.scheme is not None:
-            self.scheme.node_added.disconnect(self.add_node)
-            self.scheme.node_removed.disconnect(self.remove_node)
-
-            self.scheme.link_added.disconnect(self.add_link)
-            self.scheme.link_removed.disconnect(self.remove_link)
-
-            self.scheme.annotation_added.disconnect(self.add_annotation)
-            self.scheme.annotation_removed.disconnect(self.remove_annotation)
-
-            # Remove all items to make sure all signals from scheme items
-            # to canvas items are disconnected.
-
-            for annot in self.scheme.annotations:
-                if annot in self.__item_for_annotation:
-                    self.remove_annotation(annot)
-
-            for link in self.scheme.links:
-                if link in self.__item_for_link:
-                    self.remove_link(link)
-
-            for node in self.scheme.nodes:
-                if node in self.__item_for_node:
-                    self.remove_node(node)
-
-        self.scheme = None
-        self.__node_items = []
-        self.__item_for_node = {}
-        self.__link_items = []
-        self.__item_for_link = {}
-        self.__annotation_items = []
-        self.__item_for_annotation = {}
-
-        self.__anchor_layout.deleteLater()
-
-        self.user_interaction_handler = None
+        # Do not maintain the item index while removing all the items
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
 
-        self.clear()
+        try:
+            if self.scheme is not None:
+                self.scheme.node_added.disconnect(self.add_node)
+                self.scheme.node_removed.disconnect(self.remove_node)
+
+                self.scheme.link_added.disconnect(self.add_link)
+                self.scheme.link_removed.disconnect(self.remove_link)
+
+                self.scheme.annotation_added.disconnect(self.add_annotation)
+                self.scheme.annotation_removed.disconnect(
+                    self.remove_annotation
+                )
+
+                # Remove all items to make sure all signals from scheme items
+                # to canvas items are disconnected.
+
+                for annot in self.scheme.annotations:
+                    if annot in self.__item_for_annotation:
+                        self.remove_annotation(annot)
+
+                for link in self.scheme.links:
+                    if link in self.__item_for_link:
+                        self.remove_link(link)
+
+                for node in self.scheme.nodes:
+                    if node in self.__item_for_node:
+                        self.remove_node(node)
+
+            self.scheme = None
+            self.__node_items = []
+            self.__node_item_set = set()
+            self.__item_for_node = _Bidict()
+            self.__link_items = []
+            self.__item_for_link = _Bidict()
+            self.__outgoing = {}
+            self.__incoming = {}
+            self.__item_connections = {}
+            self.__pending_layout_nodes = {}
+            self.__layout_timer.stop()
+            self.__annotation_items = []
+            self.__item_for_annotation = _Bidict()
+
+            self.__anchor_layout.deleteLater()
+
+            self.user_interaction_handler = None
+
+            self.clear()
+        finally:
+            self.setItemIndexMethod(index_method)
 
     def set_scheme(self, scheme):
         # type: (Scheme) -> None
@@ -204,23 +267,37 @@ class CanvasScene(QGraphicsScene):
 
         self.scheme = scheme
         if self.scheme is not None:
-            self.scheme.node_added.connect(self.add_node)
-            self.scheme.node_removed.connect(self.remove_node)
+            # The scheme is only edited from the GUI thread.
+            direct = Qt.DirectConnection
+            self.scheme.node_added.connect(self.add_node, direct)
+            self.scheme.node_removed.connect(self.remove_node, direct)
 
-            self.scheme.link_added.connect(self.add_link)
-            self.scheme.link_removed.connect(self.remove_link)
+            self.scheme.link_added.connect(self.add_link, direct)
+            self.scheme.link_removed.connect(self.remove_link, direct)
 
-            self.scheme.annotation_added.connect(self.add_annotation)
-            self.scheme.annotation_removed.connect(self.remove_annotation)
+            self.scheme.annotation_added.connect(self.add_annotation, direct)
+            self.scheme.annotation_removed.connect(
+                self.remove_annotation, direct
+            )
 
-        for node in scheme.nodes:
-            self.add_node(node)
+        # Suspend the anchor layout and the item index while populating
+        # the scene and do a single layout pass/index rebuild once all the
+        # items are in.
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.__anchor_layout.setEnabled(False)
+        try:
+            for node in scheme.nodes:
+                self.add_node(node)
 
-        for link in scheme.links:
-            self.add_link(link)
+            for link in scheme.links:
+                self.add_link(link)
 
-        for annot in scheme.annotations:
-            self.add_annotation(annot)
+            for annot in scheme.annotations:
+                self.add_annotation(annot)
+        finally:
+            self.__anchor_layout.setEnabled(True)
+            self.setItemIndexMethod(index_method)
 
         self.__anchor_layout.activate()
 
@@ -238,6 +315,8 @@ class CanvasScene(QGraphicsScene):
         Set an :class:`~.layout.AnchorLayout`
         """
         if self.__anchor_layout != layout:
+            self.__pending_layout_nodes = {}
+            self.__layout_timer.stop()
             if self.__anchor_layout:
                 self.__anchor_layout.deleteLater()
                 self.__anchor_layout = None
@@ -255,9 +334,10 @@ class CanvasScene(QGraphicsScene):
         """
         Set the channel names visibility.
         """
-        self.__channel_names_visible = visible
-        for link in self.__link_items:
-            link.setChannelNamesVisible(visible)
+        if self.__channel_names_visible != visible:
+            self.__channel_names_visible = visible
+            for link in self.__link_items:
+                link.setChannelNamesVisible(visible)
 
     def channel_names_visible(self):
         # type: () -> bool
@@ -285,7 +365,7 @@ class CanvasScene(QGraphicsScene):
         """
         Add a :class:`.NodeItem` instance to the scene.
         """
-        if item in self.__node_items:
+        if item in self.__node_item_set:
             raise ValueError("%r is already in the scene." % item)
 
         if item.pos().isNull():
@@ -298,19 +378,20 @@ class CanvasScene(QGraphicsScene):
 
         item.setFont(self.font())
 
-        # Set signal mappings
-        self.activated_mapper.setMapping(item, item)
-        item.activated.connect(self.activated_mapper.map)
-
-        self.hovered_mapper.setMapping(item, item)
-        item.hovered.connect(self.hovered_mapper.map)
-
-        self.position_change_mapper.setMapping(item, item)
-        item.positionChanged.connect(self.position_change_mapper.map)
+        self.__connect_item(
+            item, item.activated, lambda: self.node_item_activated.emit(item)
+        )
+        self.__connect_item(
+            item, item.hovered, lambda: self.node_item_hovered.emit(item)
+        )
+        self.__connect_item(
+            item, item.positionChanged, lambda: self._on_position_change(item)
+        )
 
         self.addItem(item)
 
         self.__node_items.append(item)
+        self.__node_item_set.add(item)
 
         self.clearSelection()
         item.setSelected(True)
@@ -319,6 +400,7 @@ class CanvasScene(QGraphicsScene):
 
         return item
 
+    @Slot(SchemeNode)
     def add_node(self, node):
         # type: (SchemeNode) -> NodeItem
         """
@@ -350,8 +432,12 @@ class CanvasScene(QGraphicsScene):
 
         self.__item_for_node[node] = item
 
-        node.position_changed.connect(self.__on_node_pos_changed)
-        node.title_changed.connect(item.setTitle)
+        # Position and title are only changed from the GUI thread; the
+        # progress/state signals keep the default (auto) connection.
+        node.position_changed.connect(
+            self.__on_node_pos_changed, Qt.DirectConnection
+        )
+        node.title_changed.connect(item.setTitle, Qt.DirectConnection)
         node.progress_changed.connect(item.setProgress)
         node.processing_state_changed.connect(item.setProcessingState)
         node.state_message_changed.connect(item.setStateMessage)
@@ -369,10 +455,8 @@ class CanvasScene(QGraphicsScene):
         item = items.NodeItem()
         item.setWidgetDescription(widget_desc)
 
-        if category_desc is None and self.registry and widget_desc.category:
-            category_desc = self.registry.category(widget_desc.category)
-
-        if category_desc is None and self.registry is not None:
+        if category_desc is None and self.registry is not None and \
+                widget_desc.category:
             try:
                 category_desc = self.registry.category(widget_desc.category)
             except KeyError:
@@ -389,19 +473,17 @@ class CanvasScene(QGraphicsScene):
         """
         Remove `item` (:class:`.NodeItem`) from the scene.
         """
-        desc = item.widget_description
-
-        self.activated_mapper.removeMappings(item)
-        self.hovered_mapper.removeMappings(item)
-        self.position_change_mapper.removeMappings(item)
-        self.link_activated_mapper.removeMappings(item)
+        self.__disconnect_item(item)
 
         item.hide()
         self.removeItem(item)
         self.__node_items.remove(item)
+        self.__node_item_set.discard(item)
+        self.__pending_layout_nodes.pop(item, None)
 
         self.node_item_removed.emit(item)
 
+    @Slot(SchemeNode)
     def remove_node(self, node):
         # type: (SchemeNode) -> None
         """
@@ -432,14 +514,17 @@ class CanvasScene(QGraphicsScene):
         """
         Add a link (:class:`.LinkItem`) to the scene.
         """
-        self.link_activated_mapper.setMapping(item, item)
-        item.activated.connect(self.link_activated_mapper.map)
+        self.__connect_item(
+            item, item.activated, lambda: self.link_item_activated.emit(item)
+        )
 
         if item.scene() is not self:
             self.addItem(item)
 
         item.setFont(self.font())
         self.__link_items.append(item)
+        self.__outgoing.setdefault(item.sourceItem, {})[item] = None
+        self.__incoming.setdefault(item.sinkItem, {})[item] = None
 
         self.link_item_added.emit(item)
 
@@ -447,6 +532,7 @@ class CanvasScene(QGraphicsScene):
 
         return item
 
+    @Slot(SchemeLink)
     def add_link(self, scheme_link):
         # type: (SchemeLink) -> LinkItem
         """
@@ -465,12 +551,16 @@ class CanvasScene(QGraphicsScene):
                                   sink, scheme_link.sink_channel)
 
         item.setEnabled(scheme_link.is_enabled())
-        scheme_link.enabled_changed.connect(item.setEnabled)
+        scheme_link.enabled_changed.connect(
+            item.setEnabled, Qt.DirectConnection
+        )
 
         if scheme_link.is_dynamic():
             item.setDynamic(True)
             item.setDynamicEnabled(scheme_link.is_dynamic_enabled())
-            scheme_link.dynamic_enabled_changed.connect(item.setDynamicEnabled)
+            scheme_link.dynamic_enabled_changed.connect(
+                item.setDynamicEnabled, Qt.DirectConnection
+            )
 
         item.setRuntimeState(scheme_link.runtime_state())
         scheme_link.state_changed.connect(item.setRuntimeState)
@@ -485,10 +575,6 @@ class CanvasScene(QGraphicsScene):
         """
         Construct and return a new :class:`.LinkItem`
         """
-        item = items.LinkItem()
-        item.setSourceItem(source_item, source_channel)
-        item.setSinkItem(sink_item, sink_channel)
-
         def channel_name(channel):
             # type: (Union[OutputSignal, InputSignal, str]) -> str
             if isinstance(channel, str):
@@ -499,11 +585,15 @@ class CanvasScene(QGraphicsScene):
         source_name = channel_name(source_channel)
         sink_name = channel_name(sink_channel)
 
-        fmt = "<b>{0}</b>&nbsp; \u2192 &nbsp;<b>{1}</b>"
-
+        item = items.LinkItem()
+        # Set the names before the end points; the channel name text is
+        # then laid out along the curve only once (when it is complete).
         item.setSourceName(source_name)
         item.setSinkName(sink_name)
-        item.setChannelNamesVisible(self.__channel_names_visible)
+        item.setSourceItem(source_item, source_channel)
+        item.setSinkItem(sink_item, sink_channel)
+        if item.channelNamesVisible() != self.__channel_names_visible:
+            item.setChannelNamesVisible(self.__channel_names_visible)
 
         item.setAnimationEnabled(self.__node_animation_enabled)
 
@@ -516,8 +606,17 @@ class CanvasScene(QGraphicsScene):
         """
         # Invalidate the anchor layout.
         self.__anchor_layout.invalidateLink(item)
+        for adjacency, node_item in ((self.__outgoing, item.sourceItem),
+                                     (self.__incoming, item.sinkItem)):
+            links = adjacency.get(node_item)
+            if links is not None:
+                links.pop(item, None)
+                if not links:
+                    del adjacency[node_item]
         self.__link_items.remove(item)
 
+        self.__disconnect_item(item)
+
         # Remove the anchor points.
         item.removeLink()
         self.removeItem(item)
@@ -525,6 +624,7 @@ class CanvasScene(QGraphicsScene):
         self.link_item_removed.emit(item)
         return item
 
+    @Slot(SchemeLink)
     def remove_link(self, scheme_link):
         # type: (SchemeLink) -> None
         """
@@ -559,6 +659,7 @@ class CanvasScene(QGraphicsScene):
         self.annotation_added.emit(annotation)
         return annotation
 
+    @Slot(BaseSchemeAnnotation)
     def add_annotation(self, scheme_annot):
         # type: (BaseSchemeAnnotation) -> Annotation
         """
@@ -581,7 +682,9 @@ class CanvasScene(QGraphicsScene):
             font = font_from_dict(scheme_annot.font, item.font())
             item.setFont(font)
             item.setContent(scheme_annot.content, scheme_annot.content_type)
-            scheme_annot.content_changed.connect(item.setContent)
+            scheme_annot.content_changed.connect(
+                item.setContent, Qt.DirectConnection
+            )
         elif isinstance(scheme_annot, scheme.SchemeArrowAnnotation):
             item = items.ArrowAnnotation()
             start, end = scheme_annot.start_pos, scheme_annot.end_pos
@@ -589,7 +692,7 @@ class CanvasScene(QGraphicsScene):
             item.setColor(QColor(scheme_annot.color))
 
         scheme_annot.geometry_changed.connect(
-            self.__on_scheme_annot_geometry_change
+            self.__on_scheme_annot_geometry_change, Qt.DirectConnection
         )
 
         self.add_annotation_item(item)
@@ -607,6 +710,7 @@ class CanvasScene(QGraphicsScene):
         self.removeItem(annotation)
         self.annotation_removed.emit(annotation)
 
+    @Slot(BaseSchemeAnnotation)
     def remove_annotation(self, scheme_annotation):
         # type: (BaseSchemeAnnotation) -> None
         """
@@ -637,8 +741,7 @@ class CanvasScene(QGraphicsScene):
 
     def annotation_for_item(self, item):
         # type: (Annotation) -> BaseSchemeAnnotation
-        rev = {v: k for k, v in self.__item_for_annotation.items()}
-        return rev[item]
+        return self.__item_for_annotation.inv[item]
 
     def commit_scheme_node(self, node):
         """
@@ -661,8 +764,8 @@ class CanvasScene(QGraphicsScene):
             self.remove_node_item(item)
             raise
 
-        log.debug("Commited node '%s' from '%s' to '%s'" % \
-                  (node, self, self.scheme))
+        log.debug("Commited node '%s' from '%s' to '%s'",
+                  node, self, self.scheme)
 
     def commit_scheme_link(self, link):
         """
@@ -675,16 +778,15 @@ class CanvasScene(QGraphicsScene):
             raise ValueError("No 'LinkItem' for link.")
 
         self.scheme.add_link(link)
-        log.debug("Commited link '%s' from '%s' to '%s'" % \
-                  (link, self, self.scheme))
+        log.debug("Commited link '%s' from '%s' to '%s'",
+                  link, self, self.scheme)
 
     def node_for_item(self, item):
         # type: (NodeItem) -> SchemeNode
         """
         Return the `SchemeNode` for the `item`.
         """
-        rev = dict([(v, k) for k, v in self.__item_for_node.items()])
-        return rev[item]
+        return self.__item_for_node.inv[item]
 
     def item_for_node(self, node):
         # type: (SchemeNode) -> NodeItem
@@ -698,8 +800,7 @@ class CanvasScene(QGraphicsScene):
         """
         Return the `SchemeLink for `item` (:class:`LinkItem`).
         """
-        rev = dict([(v, k) for k, v in self.__item_for_link.items()])
-        return rev[item]
+        return self.__item_for_link.inv[item]
 
     def item_for_link(self, link):
         # type: (SchemeLink) -> LinkItem
@@ -739,50 +840,72 @@ class CanvasScene(QGraphicsScene):
         """
         Return a list of all output links from `node_item`.
         """
-        return [link for link in self.__link_items
-                if link.sourceItem == node_item]
+        return list(self.__outgoing.get(node_item, ()))
 
     def node_input_links(self, node_item):
         # type: (NodeItem) -> List[LinkItem]
         """
         Return a list of all input links for `node_item`.
         """
-        return [link for link in self.__link_items
-                if link.sinkItem == node_item]
+        return list(self.__incoming.get(node_item, ()))
 
     def neighbor_nodes(self, node_item):
         # type: (NodeItem) -> List[NodeItem]
         """
         Return a list of `node_item`'s (class:`NodeItem`) neighbor nodes.
         """
-        neighbors = list(map(attrgetter("sourceItem"),
-                             self.node_input_links(node_item)))
-
-        neighbors.extend(map(attrgetter("sinkItem"),
-                             self.node_output_links(node_item)))
-        return neighbors
+        return [link.sourceItem
+                for link in self.__incoming.get(node_item, ())] + \
+               [link.sinkItem
+                for link in self.__outgoing.get(node_item, ())]
 
     def set_widget_anchors_open(self, enabled: bool):
         if self.__anchors_opened == enabled:
             return
         self.__anchors_opened = enabled
 
-        for item in self.node_items():
+        for item in self.__node_items:
             item.inputAnchorItem.setAnchorOpen(enabled)
             item.outputAnchorItem.setAnchorOpen(enabled)
 
+    def __connect_item(self, item, signal, slot):
+        # type: (QGraphicsItem, Any, Callable) -> None
+        signal.connect(slot, Qt.DirectConnection)
+        self.__item_connections.setdefault(item, []).append((signal, slot))
+
+    def __disconnect_item(self, item):
+        # type: (QGraphicsItem) -> None
+        for signal, slot in self.__item_connections.pop(item, []):
+            signal.disconnect(slot)
+
     def _on_position_change(self, item):
         # type: (NodeItem) -> None
-        # Invalidate the anchor point layout for the node and schedule a layout.
-        self.__anchor_layout.invalidateNode(item)
+        # Schedule the anchor point layout invalidation for the node.
+        self.__pending_layout_nodes[item] = None
+        if not self.__layout_timer.isActive():
+            self.__layout_timer.start()
         self.node_item_position_changed.emit(item, item.pos())
 
+    def __invalidate_pending_nodes(self):
+        # type: () -> None
+        pending, self.__pending_layout_nodes = self.__pending_layout_nodes, {}
+        layout = self.__anchor_layout
+        # The items and the layout could have been deleted in the meantime
+        # (i.e. by `QGraphicsScene.clear()`)
+        if layout is None or sip.isdeleted(layout):
+            return
+        for item in pending:
+            if not sip.isdeleted(item):
+                layout.invalidateNode(item)
+
+    @Slot(object)
     def __on_node_pos_changed(self, pos):
         # type: (Tuple[float, float]) -> None
         node = self.sender()
         item = self.__item_for_node[node]
         item.setPos(*pos)
 
+    @Slot()
     def __on_scheme_annot_geometry_change(self):
         # type: () -> None
         annot = self.sender()
@@ -803,20 +926,15 @@ class CanvasScene(QGraphicsScene):
         only return the item if it is the top level item that would
         accept any of the buttons (`QGraphicsItem.acceptedMouseButtons`).
         """
-        rect = QRectF(pos, QSizeF(1, 1))
-        items = self.items(rect)
-
-        if buttons:
-            items_iter = itertools.dropwhile(
-                lambda item: not item.acceptedMouseButtons() & buttons,
-                items
-            )
-            items = list(items_iter)[:1]
-
-        if type_or_tuple:
-            items = [i for i in items if isinstance(i, type_or_tuple)]
-
-        return items[0] if items else None
+        for item in self.items(QRectF(pos, _HIT_TEST_SIZE)):
+            if buttons and not item.acceptedMouseButtons() & buttons:
+                continue
+            if not type_or_tuple or isinstance(item, type_or_tuple):
+                return item
+            if buttons:
+                # Only the top level item accepting the buttons is considered
+                return None
+        return None
 
     def mousePressEvent(self, event):
         if self.user_interaction_handler and \
@@ -903,7 +1021,7 @@ class CanvasScene(QGraphicsScene):
                 not self.user_interaction_handler.isFinished():
             self.user_interaction_handler.cancel()
 
-        log.debug("Setting interaction '%s' to '%s'" % (handler, self))
+        log.debug("Setting interaction '%s' to '%s'", handler, self)
 
         self.user_interaction_handler = handler
         if handler:
@@ -915,9 +1033,15 @@ class CanvasScene(QGraphicsScene):
             self.__animations_temporarily_disabled = False
             self.set_node_animation_enabled(True)
 
+    def __on_object_name_changed(self):
+        # type: () -> None
+        self.__str = None
+
     def __str__(self):
-        return "%s(objectName=%r, ...)" % \
-                (type(self).__name__, str(self.objectName()))
+        if self.__str is None:
+            self.__str = "%s(objectName=%r, ...)" % \
+                         (type(self).__name__, str(self.objectName()))
+        return self.__str
 
 
 def font_from_dict(font_dict, font=None):
@@ -950,6 +1074,10 @@ else:
     _QSvgGenerator = QSvgGenerator  # type: ignore
 
 
+#: SVG returned by `grab_svg` for an empty scene
+_EMPTY_SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>'
+
+
 def grab_svg(scene):
     # type: (QGraphicsScene) -> str
     """
@@ -960,15 +1088,16 @@ def grab_svg(scene):
     scene : :class:`CanvasScene`
 
     """
+    items_rect = scene.itemsBoundingRect()
+    if items_rect.isNull():
+        return _EMPTY_SVG
+
+    items_rect = items_rect.adjusted(-10, -10, 10, 10)
+
     svg_buffer = QBuffer()
     gen = _QSvgGenerator()
     gen.setOutputDevice(svg_buffer)
 
-    items_rect = scene.itemsBoundingRect().adjusted(-10, -10, 10, 10)
-
-    if items_rect.isNull():
-        items_rect = QRectF(0, 0, 10, 10)
-
     width, height = items_rect.width(), items_rect.height()
     rect_ratio = float(width) / height
 
@@ -82,6 +82,63 @@ class TestAnchorLayout(QAppTestCase):
         self.qWait()
         timer.stop()
 
+    def test_layout_on_node_move(self):
+        one_desc, negate_desc, cons_desc = self.widget_desc()
+        one_item = NodeItem()
+        one_item.setWidgetDescription(one_desc)
+        one_item.setPos(0, 150)
+        self.scene.add_node_item(one_item)
+
+        cons_item = NodeItem()
+        cons_item.setWidgetDescription(cons_desc)
+        cons_item.setPos(200, 0)
+        self.scene.add_node_item(cons_item)
+
+        negate_item = NodeItem()
+        negate_item.setWidgetDescription(negate_desc)
+        negate_item.setPos(200, 300)
+        self.scene.add_node_item(negate_item)
+
+        link1 = LinkItem()
+        link1.setSourceItem(one_item)
+        link1.setSinkItem(negate_item)
+        self.scene.add_link_item(link1)
+
+        link2 = LinkItem()
+        link2.setSourceItem(one_item)
+        link2.setSinkItem(cons_item)
+        self.scene.add_link_item(link2)
+
+        self.scene.anchor_layout().activate()
+        p1, p2 = one_item.outputAnchorItem.anchorPositions()
+        self.assertGreater(p1, p2)
+
+        # Swap the sink nodes; the (deferred) layout must follow.
+        cons_item.setPos(200, 300)
+        negate_item.setPos(200, 0)
+        self.qWait()
+        p1, p2 = one_item.outputAnchorItem.anchorPositions()
+        self.assertLess(p1, p2)
+
+        # Remove a node while its anchor invalidation is still pending.
+        negate_item.setPos(200, 150)
+        self.scene.remove_link_item(link1)
+        self.scene.remove_node_item(negate_item)
+        self.qWait()
+        self.assertSequenceEqual(self.scene.node_items(),
+                                 [one_item, cons_item])
+
+    def test_clear_with_pending_invalidation(self):
+        one_desc, _, _ = self.widget_desc()
+        item = NodeItem()
+        item.setWidgetDescription(one_desc)
+        self.scene.add_node_item(item)
+        item.setPos(100, 100)
+        # Deletes the item and the anchor layout while the node's
+        # invalidation is still pending.
+        self.scene.clear()
+        self.qWait()
+
     def widget_desc(self):
         reg = small_testing_registry()
         one_desc = reg.widget("one")
@@ -1,7 +1,10 @@
+import unittest
+
+from AnyQt.QtCore import Qt, QPointF
 from AnyQt.QtWidgets import QGraphicsView
 from AnyQt.QtGui import QPainter
 
-from ..scene import CanvasScene
+from ..scene import CanvasScene, grab_svg, _Bidict, _EMPTY_SVG
 from .. import items
 from ... import scheme
 from ...registry.tests import small_testing_registry
@@ -70,10 +73,36 @@ class TestScene(QAppTestCase):
         self.assertEqual(link2, link2a)
         self.assertSequenceEqual(self.scene.link_items(), [link1, link2])
 
+        self.assertSequenceEqual(self.scene.node_output_links(one_item),
+                                 [link1])
+        self.assertSequenceEqual(self.scene.node_input_links(one_item), [])
+        self.assertSequenceEqual(self.scene.node_input_links(negate_item),
+                                 [link1])
+        self.assertSequenceEqual(self.scene.node_output_links(negate_item),
+                                 [link2])
+        self.assertSequenceEqual(self.scene.neighbor_nodes(negate_item),
+                                 [one_item, cons_item])
+
+        # Remove and re-add a node with links attached
+        self.scene.remove_node_item(cons_item)
+        self.scene.add_node_item(cons_item)
+        self.assertSequenceEqual(self.scene.node_input_links(cons_item),
+                                 [link2])
+        self.assertSequenceEqual(self.scene.neighbor_nodes(cons_item),
+                                 [negate_item])
+
         # Remove links
         self.scene.remove_link_item(link2)
+        self.assertSequenceEqual(self.scene.node_output_links(negate_item),
+                                 [])
+        self.assertSequenceEqual(self.scene.node_input_links(cons_item), [])
+        self.assertSequenceEqual(self.scene.neighbor_nodes(negate_item),
+                                 [one_item])
+
         self.scene.remove_link_item(link1)
         self.assertSequenceEqual(self.scene.link_items(), [])
+        self.assertSequenceEqual(self.scene.node_output_links(one_item), [])
+        self.assertSequenceEqual(self.scene.neighbor_nodes(negate_item), [])
 
         self.assertTrue(link1.sourceItem is None and link1.sinkItem is None)
         self.assertTrue(link2.sourceItem is None and link2.sinkItem is None)
@@ -232,9 +261,129 @@ class TestScene(QAppTestCase):
 
         self.qWait()
 
+    def test_node_item_signals(self):
+        one_desc, _, _ = self.widget_desc()
+        item = self.scene.add_node_item(items.NodeItem(one_desc))
+        activated = []
+        self.scene.node_item_activated.connect(activated.append)
+
+        item.activated.emit()
+        self.assertSequenceEqual(activated, [item])
+
+        # A removed item no longer emits the scene's signal
+        self.scene.remove_node_item(item)
+        item.activated.emit()
+        self.assertSequenceEqual(activated, [item])
+
+        # Re-adding the item does not connect it twice
+        self.scene.add_node_item(item)
+        item.activated.emit()
+        self.assertSequenceEqual(activated, [item, item])
+
+    def test_str(self):
+        self.assertIn("objectName=''", str(self.scene))
+        self.scene.setObjectName("x")
+        self.assertIn("objectName='x'", str(self.scene))
+
+    def test_channel_names_visible(self):
+        one_desc, negate_desc, _ = self.widget_desc()
+        one_item = self.scene.add_node_item(items.NodeItem(one_desc))
+        negate_item = self.scene.add_node_item(items.NodeItem(negate_desc))
+
+        self.scene.set_channel_names_visible(False)
+        link = self.scene.new_link_item(
+            one_item, one_desc.outputs[0], negate_item, negate_desc.inputs[0]
+        )
+        self.assertFalse(link.channelNamesVisible())
+        self.assertEqual(link.linkTextItem.opacity(), 0)
+
+        self.scene.add_link_item(link)
+        self.scene.set_channel_names_visible(True)
+        self.assertTrue(link.channelNamesVisible())
+        self.assertEqual(link.linkTextItem.opacity(), 1)
+
+    def test_item_at(self):
+        one_desc, _, _ = self.widget_desc()
+        node = self.scene.add_node_item(items.NodeItem(one_desc))
+        node.setPos(0, 0)
+
+        # A straight link passing over the node, stacked above it.
+        anchor1, anchor2 = items.AnchorPoint(), items.AnchorPoint()
+        anchor1.setPos(-100, 5)
+        anchor2.setPos(100, 5)
+        link = items.LinkItem()
+        link.setSourceItem(None, anchor=anchor1)
+        link.setSinkItem(None, anchor=anchor2)
+        link.setZValue(node.zValue() + 1)
+        self.scene.addItem(link)
+
+        pos = QPointF(0, 8)
+        self.assertIsNotNone(self.scene.item_at(pos))
+        self.assertIs(self.scene.item_at(pos, items.LinkItem), link)
+        self.assertIs(self.scene.item_at(pos, items.NodeItem), node)
+        self.assertIs(
+            self.scene.item_at(pos, (items.NodeItem, items.LinkItem)), link
+        )
+        self.assertIsNone(self.scene.item_at(QPointF(0, 200)))
+
+        # With buttons only the top most item accepting them is considered
+        self.assertIs(
+            self.scene.item_at(pos, items.LinkItem, Qt.LeftButton), link
+        )
+        self.assertIs(self.scene.item_at(pos, buttons=Qt.LeftButton), link)
+        self.assertIsNone(
+            self.scene.item_at(pos, items.NodeItem, Qt.LeftButton)
+        )
+
+        link.setAcceptedMouseButtons(Qt.RightButton)
+        self.assertIsNone(
+            self.scene.item_at(pos, items.LinkItem, Qt.LeftButton)
+        )
+        self.assertIs(
+            self.scene.item_at(pos, items.LinkItem, Qt.RightButton), link
+        )
+
+    def test_grab_svg(self):
+        scene = CanvasScene()
+        self.assertEqual(grab_svg(scene), _EMPTY_SVG)
+        scene.deleteLater()
+
+        one_desc, _, _ = self.widget_desc()
+        self.scene.add_node_item(items.NodeItem(one_desc))
+        svg = grab_svg(self.scene)
+        self.assertNotEqual(svg, _EMPTY_SVG)
+        self.assertIn("<svg", svg)
+
     def widget_desc(self):
         reg = small_testing_registry()
         one_desc = reg.widget("one")
         negate_desc = reg.widget("negate")
         cons_desc = reg.widget("cons")
         return one_desc, negate_desc, cons_desc
+
+
+class TestBidict(unittest.TestCase):
+    def test_bidict(self):
+        d = _Bidict()
+        d["a"] = 1
+        d["b"] = 2
+        self.assertIn("a", d)
+        self.assertEqual(d["a"], 1)
+        self.assertEqual(d.inv[2], "b")
+
+        # Remapping a key drops its old inverse entry
+        d["a"] = 3
+        self.assertEqual(d.inv, {3: "a", 2: "b"})
+
+        # A value can only be mapped from one key
+        with self.assertRaises(ValueError):
+            d["c"] = 2
+        self.assertNotIn("c", d)
+        self.assertEqual(d.inv[2], "b")
+
+        self.assertEqual(d.pop("b"), 2)
+        self.assertNotIn("b", d)
+        self.assertEqual(d.forward, {"a": 3})
+        self.assertEqual(d.inv, {3: "a"})
+        with self.assertRaises(KeyError):
+            d.pop("b")